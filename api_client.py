@@ -0,0 +1,103 @@
+"""HTTP helpers for the walkthrough API: conditional GETs and transfer accounting.
+
+Compression is negotiated by requests itself (gzip/deflate, plus br/zstd when
+brotli/zstandard are installed). The cache and stats dicts are passed in by the
+caller so they can live in Streamlit's per-user session state.
+"""
+from io import BytesIO
+
+import requests
+from urllib3 import HTTPResponse
+
+# Per-session cap on cached response bodies (photos + JSON), evicted LRU
+HTTP_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+def new_transfer_stats():
+    return {'requests': 0, 'revalidated': 0, 'wire_bytes': 0, 'bytes_saved': 0}
+
+
+def send_request(method, url, headers=None, **kwargs):
+    """Send a request and return (response, decoded body bytes, bytes on the wire)"""
+    with requests.request(method, url, headers=headers, stream=True, **kwargs) as r:
+        raw = r.raw.read(decode_content=False)
+
+    # Count what was read: Content-Length is absent on chunked replies and may
+    # describe the full representation on a bodiless 304
+    wire_bytes = len(raw)
+
+    body = raw
+    content_encoding = r.headers.get('Content-Encoding')
+    if raw and content_encoding:
+        body = HTTPResponse(
+            body=BytesIO(raw),
+            headers={'Content-Encoding': content_encoding},
+            preload_content=False,
+            decode_content=True
+        ).read()
+    return r, body, wire_bytes
+
+
+def response_text(response, body):
+    """Decode an error body for display"""
+    return body.decode(response.encoding or 'utf-8', errors='replace')
+
+
+def record_transfer(stats, wire_bytes, payload_bytes, revalidated=False):
+    stats['requests'] += 1
+    stats['wire_bytes'] += wire_bytes
+    stats['bytes_saved'] += max(payload_bytes - wire_bytes, 0)
+    if revalidated:
+        stats['revalidated'] += 1
+
+
+def evict(cache, max_bytes):
+    """Drop least recently used entries until the cached bodies fit in max_bytes"""
+    total = sum(len(entry['body']) for entry in cache.values())
+    for url in list(cache):
+        if total <= max_bytes:
+            break
+        total -= len(cache.pop(url)['body'])
+
+
+def cached_get(url, cache, stats, max_bytes=HTTP_CACHE_MAX_BYTES, **kwargs):
+    """GET url, revalidating against cached ETag/Last-Modified validators.
+
+    A 304 reply is answered from the cache, so callers always get the full body.
+    Returns (success, body bytes or error text).
+    """
+    entry = cache.get(url)
+
+    headers = {}
+    if entry:
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    r, body, wire_bytes = send_request("GET", url, headers=headers, **kwargs)
+
+    if r.status_code == 304 and entry:
+        entry = dict(
+            entry,
+            etag=r.headers.get('ETag', entry['etag']),
+            last_modified=r.headers.get('Last-Modified', entry['last_modified'])
+        )
+        body = entry['body']
+        record_transfer(stats, wire_bytes, len(body), revalidated=True)
+    elif r.status_code == 200:
+        etag = r.headers.get('ETag')
+        last_modified = r.headers.get('Last-Modified')
+        entry = None
+        if (etag or last_modified) and len(body) <= max_bytes:
+            entry = {'etag': etag, 'last_modified': last_modified, 'body': body}
+        record_transfer(stats, wire_bytes, len(body))
+    else:
+        return False, response_text(r, body)
+
+    # Re-insert so dict order tracks recency for eviction
+    cache.pop(url, None)
+    if entry:
+        cache[url] = entry
+        evict(cache, max_bytes)
+    return True, body
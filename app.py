@@ -1,8 +1,10 @@
 import streamlit as st
 import requests
 from io import BytesIO
+import json
 import time
 from datetime import datetime
+from api_client import cached_get, new_transfer_stats, record_transfer, response_text, send_request
 
 # ==========================================
 # CONFIGURATION
@@ -251,6 +253,10 @@ if 'previous_camera_value' not in st.session_state:
     st.session_state.previous_camera_value = None
 if 'previous_audio_value' not in st.session_state:
     st.session_state.previous_audio_value = None
+if 'http_cache' not in st.session_state:
+    st.session_state.http_cache = {}
+if 'transfer_stats' not in st.session_state:
+    st.session_state.transfer_stats = new_transfer_stats()
 
 # ==========================================
 # API FUNCTIONS
@@ -273,6 +279,8 @@ def start_session():
             st.session_state.audio_count = 0
             st.session_state.report_data = None
             st.session_state.show_report = False
+            st.session_state.http_cache = {}
+            st.session_state.transfer_stats = new_transfer_stats()
             return True, data
         return False, "Failed to start"
     except Exception as e:
@@ -302,17 +310,23 @@ def upload_audio(audio_file):
 
 def generate_report():
     try:
-        r = requests.post(f"{API_BASE_URL}/walkthrough/{st.session_state.session_id}/generate")
-        return r.status_code == 200, r.json() if r.status_code == 200 else r.text
+        # Plain POST: generation is not cacheable, only its transfer is counted
+        r, body, wire_bytes = send_request("POST", f"{API_BASE_URL}/walkthrough/{st.session_state.session_id}/generate")
+        record_transfer(st.session_state.transfer_stats, wire_bytes, len(body))
+        return r.status_code == 200, json.loads(body) if r.status_code == 200 else response_text(r, body)
     except Exception as e:
         return False, str(e)
 
 def get_session_details():
     try:
-        r = requests.get(f"{API_BASE_URL}/walkthrough/{st.session_state.session_id}")
-        if r.status_code == 200:
-            return True, r.json()
-        return False, f"Failed to fetch details: {r.text}"
+        success, body = cached_get(
+            f"{API_BASE_URL}/walkthrough/{st.session_state.session_id}",
+            st.session_state.http_cache,
+            st.session_state.transfer_stats
+        )
+        if success:
+            return True, json.loads(body)
+        return False, f"Failed to fetch details: {body}"
     except Exception as e:
         return False, str(e)
 
@@ -327,6 +341,13 @@ def get_photo_url(file_path):
     """Generate URL to fetch photo from backend"""
     return f"{API_BASE_URL}/uploads/{file_path}"
 
+def fetch_photo(file_path):
+    """Fetch photo bytes, revalidating any cached copy"""
+    try:
+        return cached_get(get_photo_url(file_path), st.session_state.http_cache, st.session_state.transfer_stats)
+    except Exception as e:
+        return False, str(e)
+
 def render_report_with_photos(markdown_text, structured_data):
     """Render report and inject photos at [PHOTO_REF:Category] markers"""
     import re
@@ -337,6 +358,9 @@ def render_report_with_photos(markdown_text, structured_data):
     # Split report by lines
     lines = markdown_text.split('\n')
     
+    # Session details are fetched once per render, not once per photo
+    media_items = None
+    
     for line in lines:
         # Check if line contains photo reference
         photo_ref_match = re.search(r'\[PHOTO_REF:(.+?)\]', line)
@@ -358,23 +382,22 @@ def render_report_with_photos(markdown_text, structured_data):
                     with cols[idx % 3]:
                         try:
                             # Fetch photo from API
-                            success, details = get_session_details()
-                            if success:
-                                media_items = details.get('media_items', [])
-                                if photo_index < len(media_items):
-                                    file_path = media_items[photo_index]['file_path']
-                                    photo_url = get_photo_url(file_path)
-                                    
-                                    # Display image
-                                    response = requests.get(photo_url)
-                                    if response.status_code == 200:
-                                        st.image(
-                                            BytesIO(response.content),
-                                            caption=f"Photo {photo_index + 1}: {photo_data.get('description', 'No description')}",
-                                            use_container_width=True
-                                        )
-                                    else:
-                                        st.caption(f"Photo {photo_index + 1}: {photo_data.get('description', 'Image not available')}")
+                            if media_items is None:
+                                success, details = get_session_details()
+                                media_items = details.get('media_items', []) if success else []
+                            if photo_index < len(media_items):
+                                file_path = media_items[photo_index]['file_path']
+                                
+                                # Display image
+                                success, image_bytes = fetch_photo(file_path)
+                                if success:
+                                    st.image(
+                                        BytesIO(image_bytes),
+                                        caption=f"Photo {photo_index + 1}: {photo_data.get('description', 'No description')}",
+                                        use_container_width=True
+                                    )
+                                else:
+                                    st.caption(f"Photo {photo_index + 1}: {photo_data.get('description', 'Image not available')}")
                         except Exception as e:
                             st.caption(f"Photo {photo_index + 1}: Could not load image")
                 
@@ -502,6 +525,14 @@ if st.session_state.show_report and st.session_state.report_data:
     
     st.caption("💡 Tip: PDF will open in a new tab. You can save it from there.")
     
+    # Transfer stats - compression and cache revalidation savings
+    stats = st.session_state.transfer_stats
+    if stats['requests']:
+        st.caption(
+            f"📶 Transferred {stats['wire_bytes'] / 1024:.1f} KB, saved {stats['bytes_saved'] / 1024:.1f} KB "
+            f"({stats['revalidated']} of {stats['requests']} requests served from cache)"
+        )
+    
     st.stop()
 
 # ==========================================
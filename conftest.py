@@ -0,0 +1 @@
+# Root conftest: lets plain `pytest` import app-level modules like api_client
@@ -0,0 +1,222 @@
+import gzip
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import brotli
+import pytest
+import requests
+
+from api_client import cached_get, new_transfer_stats, record_transfer, send_request
+
+DETAILS = json.dumps({"media_items": [{"file_path": f"s/p{i}.jpg", "description": "crack in slab " * 20} for i in range(200)]}).encode()
+PHOTO = bytes(range(256)) * 64
+LAST_MODIFIED = "Mon, 19 Oct 2026 08:00:00 GMT"
+
+
+class MockBackend(BaseHTTPRequestHandler):
+    """Serves resources with ETag/Last-Modified validators and gzip/br bodies"""
+
+    resources = {
+        "/walkthrough/abc": DETAILS,
+        "/walkthrough/chunked": DETAILS,
+        "/walkthrough/br": DETAILS,
+        "/walkthrough/sized-304": DETAILS,
+        "/uploads/a.jpg": PHOTO,
+        "/uploads/b.jpg": PHOTO[::-1],
+        "/uploads/dated.jpg": PHOTO,
+    }
+    last_accept_encoding = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        MockBackend.last_accept_encoding = self.headers.get("Accept-Encoding", "")
+        if self.path == "/broken":
+            body = b"internal error"
+            self.send_response(500)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path == "/always-304":
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        if self.path == "/rotating":
+            # Every revalidation succeeds but hands out a fresh tag
+            if self.headers.get("If-None-Match"):
+                self.send_response(304)
+                self.send_header("ETag", '"v2"')
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(PHOTO)))
+            self.end_headers()
+            self.wfile.write(PHOTO)
+            return
+
+        body = self.resources[self.path]
+        dated = self.path == "/uploads/dated.jpg"
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if dated and self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+            self.send_response(304)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+            self.end_headers()
+            return
+        if not dated and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            if self.path == "/walkthrough/sized-304":
+                # Allowed by RFC 9110: the size of the 200 body, with none sent
+                self.send_header("Content-Length", str(len(gzip.compress(body))))
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        if dated:
+            self.send_header("Last-Modified", LAST_MODIFIED)
+        else:
+            self.send_header("ETag", etag)
+        accept_encoding = self.headers.get("Accept-Encoding", "")
+        if self.path == "/walkthrough/br" and "br" in accept_encoding:
+            body = brotli.compress(body)
+            self.send_header("Content-Encoding", "br")
+        elif not self.path.startswith("/uploads") and "gzip" in accept_encoding:
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        if self.path == "/walkthrough/chunked":
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(body), 1024):
+                chunk = body[i:i + 1024]
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def do_POST(self):
+        body = gzip.compress(DETAILS)
+        self.send_response(200)
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    MockBackend.protocol_version = "HTTP/1.1"
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockBackend)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def test_gzip_response_counts_compressed_bytes(base_url):
+    cache, stats = {}, new_transfer_stats()
+    success, body = cached_get(f"{base_url}/walkthrough/abc", cache, stats)
+    assert success and body == DETAILS
+    assert stats['wire_bytes'] == len(gzip.compress(DETAILS))
+    assert stats['bytes_saved'] == len(DETAILS) - stats['wire_bytes']
+
+
+def test_chunked_gzip_response_counts_bytes_read(base_url):
+    cache, stats = {}, new_transfer_stats()
+    success, body = cached_get(f"{base_url}/walkthrough/chunked", cache, stats)
+    assert success and body == DETAILS
+    assert stats['wire_bytes'] == len(gzip.compress(DETAILS))
+    assert 0 < stats['wire_bytes'] < 1000
+
+
+def test_repeat_view_replays_304_from_cache(base_url):
+    cache, stats = {}, new_transfer_stats()
+    cached_get(f"{base_url}/walkthrough/abc", cache, stats)
+    first_wire = stats['wire_bytes']
+
+    success, body = cached_get(f"{base_url}/walkthrough/abc", cache, stats)
+    assert success and body == DETAILS
+    assert stats['wire_bytes'] == first_wire
+    assert stats['revalidated'] == 1
+    assert stats['bytes_saved'] == 2 * len(DETAILS) - first_wire
+
+
+def test_cache_evicts_least_recently_used(base_url):
+    cache, stats = {}, new_transfer_stats()
+    cached_get(f"{base_url}/uploads/a.jpg", cache, stats, max_bytes=len(PHOTO) + 1)
+    cached_get(f"{base_url}/uploads/b.jpg", cache, stats, max_bytes=len(PHOTO) + 1)
+    assert list(cache) == [f"{base_url}/uploads/b.jpg"]
+
+
+def test_server_error_is_reported(base_url):
+    cache, stats = {}, new_transfer_stats()
+    success, text = cached_get(f"{base_url}/broken", cache, stats)
+    assert not success and text == "internal error"
+    assert cache == {} and stats['requests'] == 0
+
+
+def test_304_without_cached_copy_is_a_failure(base_url):
+    success, _ = cached_get(f"{base_url}/always-304", {}, new_transfer_stats())
+    assert not success
+
+
+def test_connection_error_propagates():
+    with pytest.raises(requests.ConnectionError):
+        cached_get("http://127.0.0.1:1/walkthrough/abc", {}, new_transfer_stats())
+
+
+def test_brotli_is_negotiated_and_decoded(base_url):
+    cache, stats = {}, new_transfer_stats()
+    success, body = cached_get(f"{base_url}/walkthrough/br", cache, stats)
+    assert "br" in MockBackend.last_accept_encoding
+    assert success and json.loads(body) == json.loads(DETAILS)
+    assert stats['wire_bytes'] == len(brotli.compress(DETAILS))
+
+
+def test_304_with_content_length_counts_no_body(base_url):
+    cache, stats = {}, new_transfer_stats()
+    cached_get(f"{base_url}/walkthrough/sized-304", cache, stats)
+    first_wire = stats['wire_bytes']
+
+    success, body = cached_get(f"{base_url}/walkthrough/sized-304", cache, stats)
+    assert success and body == DETAILS
+    assert stats['wire_bytes'] == first_wire
+    assert stats['bytes_saved'] == 2 * len(DETAILS) - first_wire
+
+
+def test_revalidates_by_last_modified_only(base_url):
+    cache, stats = {}, new_transfer_stats()
+    url = f"{base_url}/uploads/dated.jpg"
+    cached_get(url, cache, stats)
+    assert cache[url]['etag'] is None and cache[url]['last_modified'] == LAST_MODIFIED
+
+    success, body = cached_get(url, cache, stats)
+    assert success and body == PHOTO
+    assert stats['revalidated'] == 1
+    assert stats['wire_bytes'] == len(PHOTO)
+
+
+def test_304_stores_new_etag(base_url):
+    cache, stats = {}, new_transfer_stats()
+    url = f"{base_url}/rotating"
+    cached_get(url, cache, stats)
+    assert cache[url]['etag'] == '"v1"'
+
+    success, body = cached_get(url, cache, stats)
+    assert success and body == PHOTO
+    assert cache[url]['etag'] == '"v2"'
+
+
+def test_post_records_compressed_transfer(base_url):
+    stats = new_transfer_stats()
+    r, body, wire_bytes = send_request("POST", f"{base_url}/walkthrough/abc/generate")
+    record_transfer(stats, wire_bytes, len(body))
+    assert r.status_code == 200 and body == DETAILS
+    assert stats['wire_bytes'] == len(gzip.compress(DETAILS))
+    assert stats['bytes_saved'] == len(DETAILS) - stats['wire_bytes']